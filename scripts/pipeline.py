@@ -14,37 +14,77 @@ Examples:
 from __future__ import annotations
 
 import argparse
+import asyncio
+import bisect
+import collections
+import concurrent.futures
+import functools
+import heapq
+import itertools
 import json
+import operator
 import os
+import random
 import re
 import shutil
 import subprocess
 import sys
-from collections.abc import Iterator
-from datetime import timedelta
+import tempfile
+import time
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 
 try:
-    from openai import OpenAI
+    from openai import OpenAI, AsyncOpenAI
 except ImportError:
     OpenAI = None
+    AsyncOpenAI = None
 
 try:
     from dotenv import load_dotenv
 except ImportError:
     load_dotenv = None
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson's C parser is 2-5x faster on large payloads (ffprobe dumps,
+# packed translation chunks) and accepts str or bytes like the stdlib;
+# both raise ValueError subclasses on bad input.
+_loads = json.loads if orjson is None else orjson.loads
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+try:
+    import av
+except ImportError:
+    av = None
+
+# PyAV's top-level error class was renamed across releases.
+_AV_ERROR = getattr(av, "FFmpegError", None) or getattr(av, "AVError", OSError)
+
 
 
 # ---------------------------------------------------------------------------
 # Constants
 # ---------------------------------------------------------------------------
 
-# Merge-overlap thresholds: a secondary subtitle entry is considered to
+# Merge-overlap threshold: a secondary subtitle entry is considered to
 # overlap with a primary entry when the overlap duration meets *either*
-# of these criteria.
-MIN_OVERLAP_SECONDS = 0.2   # absolute minimum overlap (200 ms)
-MIN_OVERLAP_RATIO = 0.5     # overlap must exceed 50 % of the shorter entry
+# this absolute minimum or exceeds 50 % of the shorter entry.  All cue
+# arithmetic in the overlap kernels runs on integer milliseconds, so the
+# 50 % test is written as "overlap * 2 > shorter duration".
+MIN_OVERLAP_MS = 200
 
 CODEC_TO_EXT = {
     "subrip": "srt",
@@ -55,79 +95,275 @@ CODEC_TO_EXT = {
     "hdmv_pgs_subtitle": "sup",
 }
 
+# Constant argv fragments for building ffmpeg commands; splatted into
+# the per-call cmd list rather than appended piecewise.
+_CODEC_FLAGS_SRT = ("-c:s", "srt")
+_CODEC_FLAGS_COPY = ("-c:s", "copy")
+
 # Module-level verbosity flags, set by CLI --verbose / --quiet.
 _verbose = False
 _quiet = False
 
-
-def _parse_srt_time(time_str: str) -> timedelta:
-    """Convert SRT time string (00:00:00,000) to timedelta."""
+# ffprobe results keyed by (resolved path, mtime_ns, size) survive across
+# invocations in a small JSON file; --no-cache bypasses it.
+_PROBE_CACHE_PATH = (
+    Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    / "subtitle-pipeline"
+    / "probe.json"
+)
+_no_cache = False
+_probe_cache: dict | None = None
+
+
+@functools.lru_cache(maxsize=8192)
+def _parse_srt_time(time_str: str) -> int:
+    """Convert SRT time string (00:00:00,000) to integer milliseconds.
+
+    Timestamps repeat heavily across a file (shared cue boundaries after
+    transcoding), so results are cached; the return is an immutable int.
+    The timecode layout is fixed at ``HH:MM:SS,mmm`` (13 chars), so the
+    hot path slices the four fields at known offsets and does pure
+    integer arithmetic — no replace/split passes, no float rounding and
+    no per-cue object allocation.  Anything that does not match the
+    fixed layout (e.g. a variable-width milliseconds field) falls back
+    to the tolerant path.
+    """
+    if len(time_str) == 13 and time_str[2] == ":" and time_str[8] == ",":
+        try:
+            return (
+                int(time_str[0:2]) * 3_600_000
+                + int(time_str[3:5]) * 60_000
+                + int(time_str[6:8]) * 1000
+                + int(time_str[9:12])
+            )
+        except ValueError:
+            pass
     h, m, s_ms = time_str.replace(",", ".").split(":")
-    return timedelta(hours=int(h), minutes=int(m), seconds=float(s_ms))
+    return int(h) * 3_600_000 + int(m) * 60_000 + round(float(s_ms) * 1000)
 
 
-def _format_srt_time(td: timedelta) -> str:
-    """Convert timedelta to SRT time string (00:00:00,000)."""
-    total_seconds = td.total_seconds()
-    hours = int(total_seconds // 3600)
-    minutes = int((total_seconds % 3600) // 60)
-    seconds = total_seconds % 60
-    return f"{hours:02d}:{minutes:02d}:{seconds:06.3f}".replace(".", ",")
+@functools.lru_cache(maxsize=4096)
+def _format_srt_time(ms: int) -> str:
+    """Convert integer milliseconds to SRT time string (00:00:00,000).
 
+    A single f-string over integer divisions: no float modulo, no float
+    formatting, no trailing replace() pass.  Cached because merged
+    output repeats identical start/end values (copied from the primary),
+    so the second format of each timestamp is a dict hit.
+    """
+    return f"{ms // 3600_000:02d}:{ms // 60_000 % 60:02d}:{ms // 1000 % 60:02d},{ms % 1000:03d}"
 
-def _parse_srt(content: str) -> list[dict]:
-    """Parse SRT content into a list of dictionaries.
 
-    Handles both LF and CRLF line endings and ensures the last entry
-    is always captured even when the file lacks a trailing blank line.
-    """
-    # Normalise line endings so the regex always works.
-    content = content.replace("\r\n", "\n").replace("\r", "\n")
-    # Guarantee a trailing double-newline so the non-greedy text group
-    # can always find its terminator.
-    if not content.endswith("\n\n"):
-        content += "\n\n"
+def _parse_srt_lines(lines: Iterator[str]) -> list[dict]:
+    """Parse SRT cues from an iterator of lines.
 
+    The state machine consumes any line source — an open file, a pipe,
+    or ``str.splitlines`` — so callers can feed subprocess/file output
+    straight in without materializing the whole document first.  Lines
+    may carry their trailing newline (as file iteration yields them).
+    """
     entries = []
-    pattern = re.compile(
-        r"(\d+)\n(\d{2}:\d{2}:\d{2},\d{3}) --> (\d{2}:\d{2}:\d{2},\d{3})\n(.*?)(?=\n\n|\n\d+\n)",
-        re.DOTALL,
-    )
-    for match in pattern.finditer(content):
+    index_line = None
+    for raw in lines:
+        line = raw.rstrip("\r\n")
+        stripped = line.strip()
+        if index_line is None:
+            if stripped.isdigit():
+                index_line = stripped
+            continue
+        # We just saw an index line; this one must be the timecode.
+        if " --> " not in line:
+            index_line = stripped if stripped.isdigit() else None
+            continue
+        start_str, _, end_str = line.partition(" --> ")
+        try:
+            start = _parse_srt_time(start_str.strip())
+            end = _parse_srt_time(end_str.strip())
+        except ValueError:
+            index_line = None
+            continue
+        text_lines = []
+        for text_raw in lines:
+            text_line = text_raw.rstrip("\r\n")
+            if not text_line.strip():
+                break
+            text_lines.append(text_line)
         entries.append(
             {
-                "start": _parse_srt_time(match.group(2)),
-                "end": _parse_srt_time(match.group(3)),
-                "text": match.group(4).strip(),
-                "index": int(match.group(1)),
+                "start": start,
+                "end": end,
+                "text": "\n".join(text_lines).strip(),
+                "index": int(index_line),
             }
         )
+        index_line = None
     return entries
 
 
+# One cue: index line, timecode line, text until a blank line or EOF.
+# The timecode tail ([^\r\n]*) tolerates coordinate annotations some
+# muxers append after the end time.
+_SRT_RE = re.compile(
+    r"(\d+)[ \t]*\r?\n"
+    r"(\d{2}:\d{2}:\d{2},\d{3})[ \t]*-->[ \t]*(\d{2}:\d{2}:\d{2},\d{3})[^\r\n]*\r?\n"
+    r"(.*?)(?=\r?\n[ \t]*\r?\n|\Z)",
+    re.DOTALL,
+)
+
+
+def _parse_srt(content: str) -> list[dict]:
+    """Parse SRT content into a list of dictionaries.
+
+    When the whole document is already in memory, one ``finditer`` pass
+    keeps the scan in the C regex engine instead of per-line Python
+    dispatch; incremental sources still go through ``_parse_srt_lines``.
+    """
+    return [
+        {
+            "start": _parse_srt_time(m.group(2)),
+            "end": _parse_srt_time(m.group(3)),
+            "text": m.group(4).replace("\r", "").strip(),
+            "index": int(m.group(1)),
+        }
+        for m in _SRT_RE.finditer(content)
+    ]
+
+
+def _write_srt(entries: list[dict], path: Path) -> None:
+    """Write SRT entries straight to disk, one f-string per cue.
+
+    A large write buffer keeps syscalls rare while the full document is
+    never materialized as one string, so peak memory stays at one cue.
+    """
+    with open(path, "w", encoding="utf-8", buffering=1 << 20) as fh:
+        write = fh.write
+        for i, entry in enumerate(entries, 1):
+            write(
+                f"{i}\n"
+                f"{_format_srt_time(entry['start'])} --> {_format_srt_time(entry['end'])}\n"
+                f"{entry['text']}\n\n"
+            )
+
+
+@functools.lru_cache(maxsize=None)
+def _which(name: str) -> str | None:
+    """Cached ``shutil.which`` so repeated lookups skip the PATH scan."""
+    return shutil.which(name)
+
+
 def _require_bin(name: str) -> None:
-    if shutil.which(name) is None:
+    if _which(name) is None:
         print(f"error: missing required binary '{name}'", file=sys.stderr)
         sys.exit(2)
 
 
-def _run(cmd: list[str]) -> subprocess.CompletedProcess:
+def _run(cmd: list[str], capture: bool = True) -> subprocess.CompletedProcess:
     """Run a subprocess, capturing output with explicit UTF-8 encoding.
 
     If the module-level ``_verbose`` flag is set, any stderr output is
     forwarded to the caller's stderr even when the command succeeds.
+
+    Callers that only inspect the return code can pass ``capture=False``
+    to discard stdout without buffering or decoding it; stderr is still
+    captured so failures can be reported.
     """
-    p = subprocess.run(cmd, capture_output=True, text=True, encoding="utf-8")
+    if capture:
+        p = subprocess.run(cmd, capture_output=True, text=True, encoding="utf-8")
+    else:
+        p = subprocess.run(
+            cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+            text=True, encoding="utf-8",
+        )
     if _verbose and p.stderr:
         print(p.stderr, file=sys.stderr)
     return p
 
 
-def probe_subtitle_streams(input_path: Path) -> list[dict]:
-    cmd = [
-        "ffprobe",
-        "-v",
-        "error",
+def _run_live(cmd: list[str]) -> subprocess.CompletedProcess:
+    """Run a subprocess, forwarding stderr line-by-line under ``--verbose``.
+
+    Long jobs (whisper transcription, multi-stream extraction) can emit
+    megabytes of progress output; buffering it all and printing after
+    exit hides progress and holds the log in memory.  With ``_verbose``
+    set, each stderr line is echoed as it arrives and only a short tail
+    is retained for error reporting; otherwise this defers to ``_run``.
+    """
+    if not _verbose:
+        return _run(cmd, capture=False)
+    p = subprocess.Popen(
+        cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        text=True, encoding="utf-8",
+    )
+    tail = collections.deque(maxlen=50)
+    for line in p.stderr:
+        sys.stderr.write(line)
+        tail.append(line)
+    p.wait()
+    return subprocess.CompletedProcess(cmd, p.returncode, stdout="", stderr="".join(tail))
+
+
+def _run_bytes(cmd: list[str]) -> subprocess.CompletedProcess:
+    """Like ``_run`` but leaves stdout/stderr as raw bytes.
+
+    ``json.loads`` consumes UTF-8 bytes directly, so callers that parse
+    JSON output skip a full decode-to-str copy of the payload.
+    """
+    p = subprocess.run(cmd, capture_output=True)
+    if _verbose and p.stderr:
+        print(p.stderr.decode("utf-8", "replace"), file=sys.stderr)
+    return p
+
+
+def _probe_cache_key(input_path: Path) -> str | None:
+    """Cache key for a media file, or None when the file cannot be stat'd.
+
+    mtime and size are part of the key, so any rewrite of the file
+    naturally invalidates its cached probe result.
+    """
+    try:
+        st = input_path.stat()
+    except OSError:
+        return None
+    return f"{input_path.resolve()}|{st.st_mtime_ns}|{st.st_size}"
+
+
+def _load_probe_cache() -> dict:
+    global _probe_cache
+    if _probe_cache is None:
+        try:
+            _probe_cache = _loads(_PROBE_CACHE_PATH.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            _probe_cache = {}
+    return _probe_cache
+
+
+def _store_probe_cache(key: str, streams: list[dict]) -> None:
+    cache = _load_probe_cache()
+    # mtime/size are baked into the key, so a rewritten file would
+    # otherwise leave its superseded entry behind forever and the cache
+    # file would only ever grow; drop older entries for the same path.
+    path = key.rsplit("|", 2)[0]
+    for stale in [k for k in cache if k != key and k.rsplit("|", 2)[0] == path]:
+        del cache[stale]
+    cache[key] = streams
+    try:
+        _PROBE_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _PROBE_CACHE_PATH.write_text(json.dumps(cache), encoding="utf-8")
+    except OSError:
+        pass  # caching is best-effort; never fail the probe over it
+
+
+def _probe_raw_streams(input_path: Path, fast: bool) -> list[dict]:
+    """Run ffprobe and return the raw stream dicts.
+
+    With ``fast`` the probe window is capped (-probesize/-analyzeduration)
+    so listing streams only reads header-level data instead of scanning
+    deep into the container.
+    """
+    cmd = [_which("ffprobe") or "ffprobe", "-v", "error"]
+    if fast:
+        cmd += ["-probesize", "5000000", "-analyzeduration", "0"]
+    cmd += [
         "-select_streams",
         "s",
         "-show_entries",
@@ -136,25 +372,68 @@ def probe_subtitle_streams(input_path: Path) -> list[dict]:
         "json",
         str(input_path),
     ]
-    p = _run(cmd)
+    p = _run_bytes(cmd)
     if p.returncode != 0:
-        msg = p.stderr.strip() or "ffprobe failed"
+        msg = p.stderr.decode("utf-8", "replace").strip() or "ffprobe failed"
         raise RuntimeError(msg)
 
-    payload = json.loads(p.stdout or "{}")
-    streams = payload.get("streams", [])
-    out = []
-    for i, s in enumerate(streams):
-        tags = s.get("tags", {}) or {}
-        out.append(
+    payload = _loads(p.stdout or b"{}")
+    return payload.get("streams", [])
+
+
+def _probe_via_pyav(input_path: Path) -> list[dict]:
+    """Enumerate subtitle streams in-process through libav (PyAV).
+
+    Skips the ffprobe fork/exec and the JSON round-trip entirely while
+    producing the same stream dicts as the subprocess path.
+    """
+    try:
+        container = av.open(str(input_path))
+    except _AV_ERROR as e:
+        raise RuntimeError(str(e)) from None
+    with container:
+        return [
             {
                 "subtitle_index": i,
-                "global_index": s.get("index"),
-                "codec": s.get("codec_name", "unknown"),
-                "language": tags.get("language", "und"),
-                "title": tags.get("title", ""),
+                "global_index": s.index,
+                "codec": s.codec_context.name if s.codec_context is not None else "unknown",
+                "language": s.metadata.get("language", "und"),
+                "title": s.metadata.get("title", ""),
             }
-        )
+            for i, s in enumerate(container.streams.subtitles)
+        ]
+
+
+def probe_subtitle_streams(input_path: Path) -> list[dict]:
+    key = None if _no_cache else _probe_cache_key(input_path)
+    if key is not None:
+        cached = _load_probe_cache().get(key)
+        if cached is not None:
+            return cached
+
+    if av is not None:
+        out = _probe_via_pyav(input_path)
+    else:
+        streams = _probe_raw_streams(input_path, fast=True)
+        if not streams:
+            # Some MKVs keep subtitle track metadata beyond the capped
+            # probe window; retry with ffprobe defaults before concluding
+            # there are no subtitle streams.
+            streams = _probe_raw_streams(input_path, fast=False)
+        out = []
+        for i, s in enumerate(streams):
+            tags = s.get("tags", {}) or {}
+            out.append(
+                {
+                    "subtitle_index": i,
+                    "global_index": s.get("index"),
+                    "codec": s.get("codec_name", "unknown"),
+                    "language": tags.get("language", "und"),
+                    "title": tags.get("title", ""),
+                }
+            )
+    if key is not None:
+        _store_probe_cache(key, out)
     return out
 
 
@@ -169,27 +448,45 @@ def list_streams(input_path: Path) -> int:
         return 1
 
     if not _quiet:
-        print("subtitle_index\tglobal_index\tlanguage\tcodec\ttitle")
-        for s in streams:
-            print(
-                f"{s['subtitle_index']}\t{s['global_index']}\t{s['language']}\t{s['codec']}\t{s['title']}"
-            )
+        # One write for the whole table instead of a print (and flush)
+        # per row.
+        rows = ["subtitle_index\tglobal_index\tlanguage\tcodec\ttitle"]
+        rows += [
+            f"{s['subtitle_index']}\t{s['global_index']}\t{s['language']}\t{s['codec']}\t{s['title']}"
+            for s in streams
+        ]
+        sys.stdout.write("\n".join(rows) + "\n")
     return 0
 
 
+def _stream_maps(streams: list[dict]) -> tuple[dict, dict]:
+    """Build O(1) lookup maps keyed by subtitle index and lowercase language.
+
+    The first stream for each language wins, matching the old linear
+    scan's first-match behaviour.
+    """
+    by_index = {s["subtitle_index"]: s for s in streams}
+    by_lang: dict = {}
+    for s in streams:
+        by_lang.setdefault(str(s["language"]).lower(), s)
+    return by_index, by_lang
+
+
 def pick_stream(streams: list[dict], index: int | None, language: str | None) -> dict:
+    by_index, by_lang = _stream_maps(streams)
+
     if index is not None:
-        for s in streams:
-            if s["subtitle_index"] == index:
-                return s
-        raise ValueError(f"No subtitle stream at index {index}")
+        try:
+            return by_index[index]
+        except KeyError:
+            raise ValueError(f"No subtitle stream at index {index}") from None
 
     if language:
         language = language.lower()
-        for s in streams:
-            if str(s["language"]).lower() == language:
-                return s
-        raise ValueError(f"No subtitle stream with language={language}")
+        try:
+            return by_lang[language]
+        except KeyError:
+            raise ValueError(f"No subtitle stream with language={language}") from None
 
     if streams:
         return streams[0]
@@ -226,16 +523,14 @@ def extract_stream(
         output_path = output_path.parent / f"{output_path.name}.{chosen['language']}.{ext}"
 
     map_spec = f"0:s:{chosen['subtitle_index']}"
-    cmd = ["ffmpeg", "-y", "-i", str(input_path), "-map", map_spec]
-
-    if to_srt:
-        cmd += ["-c:s", "srt"]
-    else:
-        cmd += ["-c:s", "copy"]
-
-    cmd += [str(output_path)]
+    cmd = [
+        _which("ffmpeg") or "ffmpeg", "-y", "-i", str(input_path),
+        "-map", map_spec,
+        *(_CODEC_FLAGS_SRT if to_srt else _CODEC_FLAGS_COPY),
+        str(output_path),
+    ]
 
-    p = _run(cmd)
+    p = _run(cmd, capture=False)
     if p.returncode != 0:
         print(p.stderr.strip() or "ffmpeg failed", file=sys.stderr)
         return p.returncode
@@ -247,51 +542,206 @@ def extract_stream(
     return 0
 
 
+if np is not None and njit is not None:
+
+    @njit(parallel=True, cache=True)
+    def _overlap_pairs_jit(p_start, p_end, s_start, s_end, min_abs):  # pragma: no cover
+        """Nopython overlap kernel: returns (primary_idx, secondary_idx) arrays.
+
+        Two passes so the fill can run in parallel: count matches per
+        secondary entry, prefix-sum into offsets, then write pairs into
+        preallocated buffers.  The binary search inlines bisect_right
+        over the sorted primary end times.
+        """
+        n_s = s_start.shape[0]
+        n_p = p_start.shape[0]
+        counts = np.zeros(n_s + 1, dtype=np.int64)
+        for si in prange(n_s):
+            ss = s_start[si]
+            se = s_end[si]
+            lo = 0
+            hi = n_p
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if p_end[mid] <= ss:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            c = 0
+            j = lo
+            while j < n_p and p_start[j] < se:
+                o = min(p_end[j], se) - max(p_start[j], ss)
+                if o > 0:
+                    if o >= min_abs or o * 2 > min(se - ss, p_end[j] - p_start[j]):
+                        c += 1
+                j += 1
+            counts[si + 1] = c
+        offsets = np.cumsum(counts)
+        out_p = np.empty(offsets[n_s], dtype=np.int64)
+        out_s = np.empty(offsets[n_s], dtype=np.int64)
+        for si in prange(n_s):
+            ss = s_start[si]
+            se = s_end[si]
+            lo = 0
+            hi = n_p
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if p_end[mid] <= ss:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            k = offsets[si]
+            j = lo
+            while j < n_p and p_start[j] < se:
+                o = min(p_end[j], se) - max(p_start[j], ss)
+                if o > 0:
+                    if o >= min_abs or o * 2 > min(se - ss, p_end[j] - p_start[j]):
+                        out_p[k] = j
+                        out_s[k] = si
+                        k += 1
+                j += 1
+        return out_p, out_s
+
+else:
+    _overlap_pairs_jit = None
+
+# Below this many secondary cues the one-off JIT compile (even cached)
+# is not worth paying; stick to the NumPy/Python paths.
+_JIT_MIN_ENTRIES = 1000
+
+
+def _overlap_pairs(
+    p_starts: list[int],
+    p_ends: list[int],
+    s_starts: list[int],
+    s_ends: list[int],
+) -> list[tuple[int, int]]:
+    """Return (primary_idx, secondary_idx) pairs that pass the overlap test.
+
+    All inputs are integer milliseconds, sorted by start time, so every
+    comparison is exact integer arithmetic.  When NumPy is available the
+    candidate windows are located with two ``searchsorted`` calls and
+    each window is evaluated with vectorized min/max over contiguous
+    int64 arrays (an SoA layout); otherwise a pure-Python bisect sweep
+    over the same lists is used.
+    """
+    pairs: list[tuple[int, int]] = []
+
+    if np is not None:
+        p_start_a = np.asarray(p_starts, dtype=np.int64)
+        p_end_a = np.asarray(p_ends, dtype=np.int64)
+        s_start_a = np.asarray(s_starts, dtype=np.int64)
+        s_end_a = np.asarray(s_ends, dtype=np.int64)
+        if _overlap_pairs_jit is not None and len(s_starts) >= _JIT_MIN_ENTRIES:
+            out_p, out_s = _overlap_pairs_jit(
+                p_start_a, p_end_a, s_start_a, s_end_a, MIN_OVERLAP_MS
+            )
+            return list(zip(out_p.tolist(), out_s.tolist()))
+        # First primary whose end is past the secondary's start, and first
+        # primary starting at/after the secondary's end, bound the window.
+        los = np.searchsorted(p_end_a, s_start_a, side="right")
+        his = np.searchsorted(p_start_a, s_end_a, side="left")
+        for si in range(len(s_starts)):
+            lo, hi = int(los[si]), int(his[si])
+            if lo >= hi:
+                continue
+            o_len = np.minimum(p_end_a[lo:hi], s_end_a[si]) - np.maximum(
+                p_start_a[lo:hi], s_start_a[si]
+            )
+            p_len = p_end_a[lo:hi] - p_start_a[lo:hi]
+            s_len = s_end_a[si] - s_start_a[si]
+            ok = (o_len > 0) & (
+                (o_len >= MIN_OVERLAP_MS)
+                | (o_len * 2 > np.minimum(p_len, s_len))
+            )
+            for j in np.nonzero(ok)[0]:
+                pairs.append((lo + int(j), si))
+        return pairs
+
+    n_primary = len(p_starts)
+    for si in range(len(s_starts)):
+        s_start, s_end = s_starts[si], s_ends[si]
+        s_len = s_end - s_start
+        # First primary whose end is past this secondary's start; bisect
+        # runs in C and makes each secondary independent of the others.
+        j = bisect.bisect_right(p_ends, s_start)
+        while j < n_primary and p_starts[j] < s_end:
+            o_len = min(p_ends[j], s_end) - max(p_starts[j], s_start)
+            if o_len > 0:
+                p_len = p_ends[j] - p_starts[j]
+                if o_len >= MIN_OVERLAP_MS or o_len * 2 > min(s_len, p_len):
+                    pairs.append((j, si))
+            j += 1
+    return pairs
+
+
 def _merge_parsed(contents: list[list[dict]]) -> list[dict]:
     """Pure merge logic: combine parsed SRT entries from multiple streams.
 
     The first list in *contents* is the primary stream.  Entries from
     secondary streams are attached to overlapping primary entries, or
     kept standalone when there is no overlap.
+
+    Cue times are already integer milliseconds; per stream they are
+    laid out once into parallel start/end lists, and the overlap join
+    itself runs in `_overlap_pairs` over that structure-of-arrays view
+    rather than per-entry arithmetic.
     """
+    # itemgetter is C-implemented, so sort/merge key extraction skips a
+    # Python frame per element.
+    by_start = operator.itemgetter("start")
+    primary_sorted = sorted(contents[0], key=by_start)
+    # "seen" mirrors "texts" as a set so the dedup check below is O(1)
+    # instead of scanning the list for every overlap hit.
     primary_entries = [
-        {"start": e["start"], "end": e["end"], "texts": [e["text"]]}
-        for e in contents[0]
+        {"start": e["start"], "end": e["end"], "texts": [e["text"]], "seen": {e["text"]}}
+        for e in primary_sorted
     ]
+    p_starts = [e["start"] for e in primary_sorted]
+    p_ends = [e["end"] for e in primary_sorted]
 
-    standalone_entries: list[dict] = []
+    standalone_per_stream: list[list[dict]] = []
     for stream_idx in range(1, len(contents)):
-        for s_entry in contents[stream_idx]:
-            overlaps: list[dict] = []
-            s_len = (s_entry["end"] - s_entry["start"]).total_seconds()
-
-            for p_entry in primary_entries:
-                overlap_start = max(p_entry["start"], s_entry["start"])
-                overlap_end = min(p_entry["end"], s_entry["end"])
-                o_len = (overlap_end - overlap_start).total_seconds()
-                if o_len > 0:
-                    p_len = (p_entry["end"] - p_entry["start"]).total_seconds()
-                    if o_len >= MIN_OVERLAP_SECONDS or o_len > MIN_OVERLAP_RATIO * min(s_len, p_len):
-                        overlaps.append(p_entry)
-
-            if not overlaps:
-                standalone_entries.append(
-                    {"start": s_entry["start"], "end": s_entry["end"], "texts": [s_entry["text"]]}
-                )
-            else:
-                for p in overlaps:
-                    if s_entry["text"] not in p["texts"]:
-                        p["texts"].append(s_entry["text"])
-
-    merged = [
-        {"start": p["start"], "end": p["end"], "text": "\n".join(p["texts"])}
-        for p in primary_entries
-    ] + [
-        {"start": s["start"], "end": s["end"], "text": "\n".join(s["texts"])}
-        for s in standalone_entries
+        secondary = sorted(contents[stream_idx], key=by_start)
+        s_starts = [e["start"] for e in secondary]
+        s_ends = [e["end"] for e in secondary]
+
+        matched = [False] * len(secondary)
+        for p_idx, s_idx in _overlap_pairs(p_starts, p_ends, s_starts, s_ends):
+            matched[s_idx] = True
+            p = primary_entries[p_idx]
+            text = secondary[s_idx]["text"]
+            if text not in p["seen"]:
+                p["seen"].add(text)
+                p["texts"].append(text)
+
+        standalone_per_stream.append(
+            [
+                {"start": s_entry["start"], "end": s_entry["end"], "texts": [s_entry["text"]]}
+                for s_idx, s_entry in enumerate(secondary)
+                if not matched[s_idx]
+            ]
+        )
+
+    # Every per-stream list is already sorted by start time, so a k-way
+    # heapq.merge yields the combined order in O(N) instead of re-sorting.
+    return [
+        {"start": e["start"], "end": e["end"], "text": "\n".join(e["texts"])}
+        for e in heapq.merge(
+            primary_entries, *standalone_per_stream, key=by_start
+        )
     ]
-    merged.sort(key=lambda x: x["start"])
-    return merged
+
+
+def _parse_srt_file(path: Path) -> list[dict]:
+    """Read and parse one extracted SRT file.
+
+    Module-level so it can be shipped to ProcessPoolExecutor workers;
+    feeds the handle straight into the streaming parser rather than
+    materializing the whole SRT as one string first.
+    """
+    with path.open(encoding="utf-8") as fh:
+        return _parse_srt_lines(fh)
 
 
 def merge_streams(
@@ -309,29 +759,22 @@ def merge_streams(
         print("No subtitle streams found.", file=sys.stderr)
         return 1
 
+    by_index, by_lang = _stream_maps(streams)
     chosen_streams = []
     if indices:
         for idx in indices:
-            found = False
-            for s in streams:
-                if s["subtitle_index"] == idx:
-                    chosen_streams.append(s)
-                    found = True
-                    break
-            if not found:
+            s = by_index.get(idx)
+            if s is None:
                 print(f"error: No subtitle stream at index {idx}", file=sys.stderr)
                 return 1
+            chosen_streams.append(s)
     elif languages:
         for lang in languages:
-            found = False
-            for s in streams:
-                if str(s["language"]).lower() == lang.lower():
-                    chosen_streams.append(s)
-                    found = True
-                    break
-            if not found:
+            s = by_lang.get(lang.lower())
+            if s is None:
                 print(f"error: No subtitle stream with language={lang}", file=sys.stderr)
                 return 1
+            chosen_streams.append(s)
     else:
         # Default to first two streams if available
         chosen_streams = streams[:2]
@@ -340,44 +783,158 @@ def merge_streams(
         print("error: Need at least 2 streams to merge.", file=sys.stderr)
         return 1
 
-    # Extract all chosen streams to SRT format in-memory
-    contents = []
-    for s in chosen_streams:
-        map_spec = f"0:s:{s['subtitle_index']}"
-        cmd = ["ffmpeg", "-y", "-i", str(input_path), "-map", map_spec, "-c:s", "srt", "-f", "srt", "-"]
-        p = _run(cmd)
+    # Extract all chosen streams in a single ffmpeg pass: one -map output
+    # per stream written into a temp dir, so the container is opened and
+    # demuxed once instead of once per stream.
+    with tempfile.TemporaryDirectory(prefix="subtitle-merge-") as tmp_dir:
+        cmd = [_which("ffmpeg") or "ffmpeg", "-y", "-nostdin", "-i", str(input_path)]
+        out_files = []
+        for s in chosen_streams:
+            out = Path(tmp_dir) / f"{s['subtitle_index']}.srt"
+            cmd += ["-map", f"0:s:{s['subtitle_index']}", *_CODEC_FLAGS_SRT, str(out)]
+            out_files.append(out)
+
+        p = _run_live(cmd)
         if p.returncode != 0:
-            print(f"ffmpeg failed for stream {s['subtitle_index']}", file=sys.stderr)
+            print("ffmpeg failed extracting subtitle streams", file=sys.stderr)
             return p.returncode
-        contents.append(_parse_srt(p.stdout))
 
-    merged_entries = _merge_parsed(contents)
+        for s, out in zip(chosen_streams, out_files):
+            if not out.exists():
+                print(f"ffmpeg produced no output for stream {s['subtitle_index']}", file=sys.stderr)
+                return 1
 
-    # Generate SRT output
-    lines = []
-    for i, entry in enumerate(merged_entries, 1):
-        lines.append(str(i))
-        lines.append(f"{_format_srt_time(entry['start'])} --> {_format_srt_time(entry['end'])}")
-        lines.append(entry["text"])
-        lines.append("")
+        # Parsing each file is independent CPU-bound work, so with three
+        # or more streams a process pool sidesteps the GIL; for the
+        # common two-stream merge the pool start-up would cost more than
+        # it saves, so that stays serial.
+        if len(out_files) > 2:
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=min(len(out_files), os.cpu_count() or 1)
+            ) as ex:
+                contents = list(ex.map(_parse_srt_file, out_files))
+        else:
+            contents = [_parse_srt_file(out) for out in out_files]
 
-    merged_srt = "\n".join(lines)
+    merged_entries = _merge_parsed(contents)
 
     if output_path is None:
         langs = "-".join([s["language"] for s in chosen_streams])
         output_path = input_path.with_suffix("")
         output_path = output_path.parent / f"{output_path.name}.{langs}.merged.srt"
 
-    output_path.write_text(merged_srt, encoding="utf-8")
+    _write_srt(merged_entries, output_path)
     if not _quiet:
         print(f"Merged {len(chosen_streams)} streams into -> {output_path}")
     return 0
 
 
-def _chunk_list(lst: list, chunk_size: int) -> Iterator[list]:
-    """Yield successive n-sized chunks from lst."""
-    for i in range(0, len(lst), chunk_size):
-        yield lst[i:i + chunk_size]
+def _extract_to_string(input_path: Path, index: int) -> str | None:
+    """Extract one subtitle stream as SRT text via ffmpeg stdout.
+
+    Skips the temp-file write/read/unlink cycle entirely; returns None
+    (with the error printed) when ffmpeg fails.
+    """
+    cmd = [
+        _which("ffmpeg") or "ffmpeg", "-nostdin", "-i", str(input_path),
+        "-map", f"0:s:{index}", "-f", "srt", "-",
+    ]
+    p = _run(cmd)
+    if p.returncode != 0:
+        print(p.stderr.strip() or "ffmpeg failed extracting subtitle stream", file=sys.stderr)
+        return None
+    return p.stdout
+
+
+def _chunk_list(items: Iterable, chunk_size: int) -> Iterator[list]:
+    """Yield successive n-sized chunks from any iterable.
+
+    islice over a shared iterator consumes the input lazily, so chunks
+    can be produced from a stream without holding the whole sequence.
+    """
+    it = iter(items)
+    while chunk := list(itertools.islice(it, chunk_size)):
+        yield chunk
+
+
+def _chunk_by_tokens(entries: list[dict], token_budget: int) -> list[list[dict]]:
+    """Group subtitle entries so each chunk's estimated prompt fits the budget.
+
+    Costs are estimated at ~4 characters per token plus a small per-line
+    framing overhead.  A chunk always takes at least one entry, so an
+    oversized line cannot stall progress.  Filling each request closer
+    to the budget sends far fewer requests than a fixed 50-line split,
+    which matters under tight RPM limits.
+    """
+    chunks: list[list[dict]] = []
+    current: list[dict] = []
+    used = 0
+    for entry in entries:
+        cost = len(entry["text"]) // 4 + 8  # text plus "Line N: " framing
+        if current and used + cost > token_budget:
+            chunks.append(current)
+            current = []
+            used = 0
+        current.append(entry)
+        used += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+# Prompt scaffolding, built once at import instead of re-concatenated per
+# chunk. The {n}/{language} slots are the only per-chunk variation.
+_TRANSLATE_SYS_MSG = "You are a professional subtitle translator. You only output valid JSON arrays of strings."
+_TRANSLATE_PROMPT_HEADER = (
+    "You are a professional movie translator. Translate the following {n} subtitle lines to {language}.\n\n"
+    "Respond ONLY with a valid JSON array of strings, where each string is the translated line. Do not include markdown formatting like ```json.\n"
+    "There are exactly {n} lines. You MUST return exactly {n} translated strings in the JSON array. Do not include original text, notes, or preambles.\n"
+    "Look at the surrounding context to resolve ambiguities, but keep the translations vertically aligned to the original indices.\n\n"
+)
+
+
+def _build_translation_messages(chunk: list[dict], target_language: str) -> list[dict]:
+    """Build the chat messages asking the LLM to translate one chunk."""
+    parts = [_TRANSLATE_PROMPT_HEADER.format(n=len(chunk), language=target_language)]
+    parts.extend(f"Line {entry['index']}: {entry['text']}\n" for entry in chunk)
+    return [
+        {"role": "system", "content": _TRANSLATE_SYS_MSG},
+        {"role": "user", "content": "".join(parts)},
+    ]
+
+
+def _parse_translation_response(content: str, chunk: list[dict]) -> list[str]:
+    """Parse an LLM response into exactly ``len(chunk)`` translated lines."""
+    # Strip markdown fences the model may add despite the prompt;
+    # removeprefix/removesuffix are single C-level passes and no-ops on
+    # already-clean output.
+    content = (
+        content.strip()
+        .removeprefix("```json")
+        .removeprefix("```")
+        .removesuffix("```")
+    )
+
+    try:
+        translated_texts = _loads(content.strip())
+    except ValueError:
+        print(f"Warning: Failed to parse LLM output as JSON. Output was:\n{content}\nAttempting line-by-line fallback...", file=sys.stderr)
+        translated_texts = [p.strip() for p in content.strip().split('\n') if p.strip()]
+    else:
+        if not isinstance(translated_texts, list):
+            raise ValueError("LLM did not return a JSON array")
+
+    # Fallback/Safety Check: Ensure strictly identical length
+    if len(translated_texts) != len(chunk):
+        print(f"Warning: LLM returned {len(translated_texts)} lines instead of {len(chunk)}.", file=sys.stderr)
+        print(f"Warning: Fallback failed. Adding blank lines to match length. Expected {len(chunk)}, got {len(translated_texts)}.", file=sys.stderr)
+        # Take what we can; preallocate the padding instead of append-looping
+        padded = [""] * len(chunk)
+        kept = translated_texts[:len(chunk)]
+        padded[:len(kept)] = kept
+        translated_texts = padded
+
+    return translated_texts
 
 
 def translate_chunk(client, chunk: list[dict], target_language: str, model: str) -> list[str]:
@@ -386,66 +943,115 @@ def translate_chunk(client, chunk: list[dict], target_language: str, model: str)
     """
     if not OpenAI:
         raise RuntimeError("openai is not installed. Run: pip install openai")
-        
-    prompt = f"You are a professional movie translator. Translate the following {len(chunk)} subtitle lines to {target_language}.\n\n"
-    prompt += "Respond ONLY with a valid JSON array of strings, where each string is the translated line. Do not include markdown formatting like ```json.\n"
-    prompt += f"There are exactly {len(chunk)} lines. You MUST return exactly {len(chunk)} translated strings in the JSON array. Do not include original text, notes, or preambles.\n"
-    prompt += "Look at the surrounding context to resolve ambiguities, but keep the translations vertically aligned to the original indices.\n\n"
-    
-    for entry in chunk:
-        prompt += f"Line {entry['index']}: {entry['text']}\n"
 
     try:
         response = client.chat.completions.create(
             model=model,
-            messages=[
-                {"role": "system", "content": "You are a professional subtitle translator. You only output valid JSON arrays of strings."},
-                {"role": "user", "content": prompt}
-            ],
+            messages=_build_translation_messages(chunk, target_language),
             temperature=0.3
         )
-        
-        content = response.choices[0].message.content.strip()
-        if content.startswith("```json"):
-            content = content[7:]
-        if content.startswith("```"):
-            content = content[3:]
-        if content.endswith("```"):
-            content = content[:-3]
-
-        try:
-            translated_texts = json.loads(content.strip())
-            if not isinstance(translated_texts, list):
-                raise ValueError("LLM did not return a JSON array")
-        except json.JSONDecodeError:
-            print(f"Warning: Failed to parse LLM output as JSON. Output was:\n{content}\nAttempting line-by-line fallback...", file=sys.stderr)
-            translated_texts = [p.strip() for p in content.strip().split('\n') if p.strip()]
-        
-        # Fallback/Safety Check: Ensure strictly identical length
-        if len(translated_texts) != len(chunk):
-            print(f"Warning: LLM returned {len(translated_texts)} lines instead of {len(chunk)}.", file=sys.stderr)
-            print(f"Warning: Fallback failed. Adding blank lines to match length. Expected {len(chunk)}, got {len(translated_texts)}.", file=sys.stderr)
-            # Just take what we can and pad the rest with empty strings
-            translated_texts = translated_texts[:len(chunk)]
-            while len(translated_texts) < len(chunk):
-                translated_texts.append("")
-                
-        return translated_texts
-        
+        return _parse_translation_response(response.choices[0].message.content, chunk)
     except Exception as e:
         print(f"Error calling LLM: {e}", file=sys.stderr)
         raise
 
+
+class _RateBucket:
+    """Async token bucket refilled continuously at ``per_minute / 60`` per second.
+
+    One instance paces requests (cost 1 per call), another paces tokens
+    (cost = estimated prompt+output tokens), so the dispatcher can sit
+    just under the provider's per-minute limits instead of tripping 429s.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        # A cost above capacity could never be satisfied (level is capped
+        # at capacity), so the wait loop would spin forever. Clamp it:
+        # the oversized request drains the bucket fully, which still
+        # paces the caller at the configured per-minute rate.
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.level >= amount:
+                    self.level -= amount
+                    return
+                await asyncio.sleep((amount - self.level) / self.rate)
+
+
+def _estimate_tokens(chunk: list[dict], target_language: str) -> int:
+    """Rough token estimate for one chunk: ~4 chars/token plus output slack."""
+    messages = _build_translation_messages(chunk, target_language)
+    prompt_tokens = sum(len(m["content"]) for m in messages) // 4
+    return int(prompt_tokens * 1.3)
+
+
+# Transient API failures worth retrying: throttling and server-side errors.
+_RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+_MAX_TRANSLATE_ATTEMPTS = 5
+
+
+def _is_retryable_llm_error(exc: Exception) -> bool:
+    """Whether an API error is transient (throttling/5xx) and worth retrying."""
+    if getattr(exc, "status_code", None) in _RETRYABLE_STATUS_CODES:
+        return True
+    text = str(exc).lower()
+    return "rate limit" in text or "quota" in text
+
+
+async def _translate_chunk_async(client, chunk: list[dict], target_language: str, model: str) -> list[str]:
+    """Async counterpart of ``translate_chunk`` for the concurrent dispatcher.
+
+    Transient errors (429/5xx/rate-limit) are retried with doubling
+    backoff plus jitter instead of aborting the whole translation job.
+    """
+    for attempt in range(_MAX_TRANSLATE_ATTEMPTS):
+        try:
+            response = await client.chat.completions.create(
+                model=model,
+                messages=_build_translation_messages(chunk, target_language),
+                temperature=0.3
+            )
+            return _parse_translation_response(response.choices[0].message.content, chunk)
+        except Exception as e:
+            if attempt == _MAX_TRANSLATE_ATTEMPTS - 1 or not _is_retryable_llm_error(e):
+                print(f"Error calling LLM: {e}", file=sys.stderr)
+                raise
+            delay = min(60.0, 2 ** attempt + random.random())
+            print(f"Warning: transient LLM error ({e}); retrying in {delay:.1f}s...", file=sys.stderr)
+            await asyncio.sleep(delay)
+
+
 def translate_stream(
     input_path: Path,
     output_path: Path | None,
     target_language: str,
     api_key: str | None = None,
     base_url: str | None = None,
-    model: str = "gpt-4o-mini"
+    model: str = "gpt-4o-mini",
+    max_concurrency: int = 8,
+    rpm: int | None = None,
+    tpm: int | None = None,
+    chunk_tokens: int = 3000
 ) -> int:
-    """Extract a track (if video), and translate using LLM context chunking."""
-    if not OpenAI:
+    """Extract a track (if video), and translate using LLM context chunking.
+
+    Chunks are translated concurrently with AsyncOpenAI; in-flight
+    requests are bounded by ``max_concurrency`` and results are
+    reassembled in original chunk order.  When ``rpm``/``tpm`` are set,
+    dispatch is additionally paced by request and token buckets so the
+    job stays under the provider's per-minute limits.
+    """
+    if OpenAI is None or AsyncOpenAI is None:
         print("error: openai package is required. Run 'pip install openai'", file=sys.stderr)
         return 1
         
@@ -458,73 +1064,71 @@ def translate_stream(
         print("error: API key is required via --api-key or OPENAI_API_KEY env var in .env file.", file=sys.stderr)
         return 1
         
-    client = OpenAI(api_key=client_api_key, base_url=base_url)
-
-    # If it's not an srt, assume it's a video and try to extract the first track to a temporary file,
-    # or fail if multiple tracks? For now assume it's already an SRT if it ends with .srt
-    srt_content = ""
-    is_temp_srt = False
-    temp_srt_path = input_path.with_suffix(".tmp.srt")
-    
+    # If it's not an srt, assume it's a video and pull the first subtitle
+    # track straight off ffmpeg stdout — no temp file round-trip.
     if input_path.suffix.lower() == ".srt":
         srt_content = input_path.read_text(encoding="utf-8")
     else:
         print(f"Extracting primary subtitle stream from {input_path.name} to translate...")
-        ret = extract_stream(input_path, temp_srt_path, index=0, language=None, to_srt=True)
-        if ret != 0:
-            return ret
-        srt_content = temp_srt_path.read_text(encoding="utf-8")
-        is_temp_srt = True
+        extracted = _extract_to_string(input_path, 0)
+        if extracted is None:
+            return 1
+        srt_content = extracted
 
     entries = _parse_srt(srt_content)
     if not entries:
         print("error: No subtitle entries found to translate.", file=sys.stderr)
-        if is_temp_srt and temp_srt_path.exists(): temp_srt_path.unlink()
         return 1
 
     print(f"Translating {len(entries)} subtitle segments to {target_language}...")
     
-    # Process in chunks of 50
-    CHUNK_SIZE = 50
-    translated_entries = []
-    chunks = list(_chunk_list(entries, CHUNK_SIZE))
-    
+    # Pack entries into chunks up to the prompt-token budget.
+    chunks = _chunk_by_tokens(entries, chunk_tokens)
+
+    async def _translate_all() -> list[list[str]]:
+        client = AsyncOpenAI(api_key=client_api_key, base_url=base_url)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        rpm_bucket = _RateBucket(rpm) if rpm else None
+        tpm_bucket = _RateBucket(tpm) if tpm else None
+
+        async def bounded(i: int, chunk: list[dict]) -> list[str]:
+            async with semaphore:
+                if rpm_bucket is not None:
+                    await rpm_bucket.acquire()
+                if tpm_bucket is not None:
+                    await tpm_bucket.acquire(_estimate_tokens(chunk, target_language))
+                if _verbose:
+                    print(f"Translating chunk {i}/{len(chunks)}...", file=sys.stderr)
+                return await _translate_chunk_async(client, chunk, target_language, model=model)
+
+        # gather preserves submission order, so results line up with
+        # chunks regardless of completion order.
+        return await asyncio.gather(
+            *(bounded(i, chunk) for i, chunk in enumerate(chunks, 1))
+        )
+
     try:
-        for i, chunk in enumerate(chunks, 1):
-            if _verbose:
-                print(f"Translating chunk {i}/{len(chunks)}...", file=sys.stderr)
-            texts = translate_chunk(client, chunk, target_language, model=model)
-            for entry, trans_text in zip(chunk, texts):
-                # Copy the entry and update the text
-                translated_entries.append({
-                    "start": entry["start"],
-                    "end": entry["end"],
-                    "text": trans_text
-                })
-    except Exception as e:
+        results = asyncio.run(_translate_all())
+    except Exception:
         print("Translation aborted due to an error.", file=sys.stderr)
-        if is_temp_srt and temp_srt_path.exists(): temp_srt_path.unlink()
         return 1
 
-    # Format back to SRT
-    lines = []
-    for i, entry in enumerate(translated_entries, 1):
-        lines.append(str(i))
-        lines.append(f"{_format_srt_time(entry['start'])} --> {_format_srt_time(entry['end'])}")
-        lines.append(entry["text"])
-        lines.append("")
-        
-    translated_srt_content = "\n".join(lines)
-    
+    translated_entries = []
+    for chunk, texts in zip(chunks, results):
+        for entry, trans_text in zip(chunk, texts):
+            # Copy the entry and update the text
+            translated_entries.append({
+                "start": entry["start"],
+                "end": entry["end"],
+                "text": trans_text
+            })
+
     if output_path is None:
         output_path = input_path.parent / f"{input_path.stem}.{target_language.lower()}.srt"
-        
-    output_path.write_text(translated_srt_content, encoding="utf-8")
+
+    _write_srt(translated_entries, output_path)
     print(f"Translation complete! Saved to {output_path}")
-    
-    if is_temp_srt and temp_srt_path.exists():
-        temp_srt_path.unlink()
-        
+
     return 0
 
 
@@ -535,14 +1139,15 @@ def transcribe_stream(
     language: str | None = None
 ) -> int:
     """Run Whisper ASR on a media file to generate subtitles."""
-    if shutil.which("whisper") is None:
+    whisper_bin = _which("whisper")
+    if whisper_bin is None:
         print("error: 'whisper' command not found. Please install openai-whisper.", file=sys.stderr)
         return 1
 
     print(f"Transcribing {input_path.name} using Whisper ({model} model)...")
-    
+
     cmd = [
-        "whisper",
+        whisper_bin,
         str(input_path),
         "--model", model,
         "--output_format", "srt",
@@ -553,8 +1158,8 @@ def transcribe_stream(
         
     out_dir = output_path.parent if output_path else input_path.parent
     cmd.extend(["--output_dir", str(out_dir)])
-    
-    p = _run(cmd)
+
+    p = _run_live(cmd)
     if p.returncode != 0:
         print(p.stderr.strip() or "whisper failed", file=sys.stderr)
         return p.returncode
@@ -585,6 +1190,10 @@ def main() -> int:
         "--quiet", "-q", action="store_true",
         help="suppress informational output (errors are still printed)",
     )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="do not read or write the cached ffprobe results",
+    )
     sub = parser.add_subparsers(dest="command", required=True)
 
     p_list = sub.add_parser("list", help="List subtitle streams")
@@ -614,6 +1223,10 @@ def main() -> int:
     p_translate.add_argument("--base-url", type=str, help="Custom Base URL for alternative providers (e.g. DeepSeek, vLLM)")
     p_translate.add_argument("--model", type=str, default="gpt-4o-mini", help="Model name to use (default: gpt-4o-mini)")
     p_translate.add_argument("--output", type=Path, default=None, help="output .srt file path")
+    p_translate.add_argument("--max-concurrency", type=int, default=8, help="maximum in-flight translation requests (default: 8)")
+    p_translate.add_argument("--rpm", type=int, default=None, help="pace requests to this many per minute (default: unlimited)")
+    p_translate.add_argument("--tpm", type=int, default=None, help="pace estimated tokens to this many per minute (default: unlimited)")
+    p_translate.add_argument("--chunk-tokens", type=int, default=3000, help="estimated prompt-token budget per translation request (default: 3000)")
 
     p_transcribe = sub.add_parser("transcribe", help="Transcribe video/audio to subtitle using Whisper ASR")
     p_transcribe.add_argument("input", type=Path, help="input video or audio file")
@@ -623,10 +1236,11 @@ def main() -> int:
 
     args = parser.parse_args()
 
-    # Set module-level verbosity.
-    global _verbose, _quiet
+    # Set module-level verbosity and caching.
+    global _verbose, _quiet, _no_cache
     _verbose = args.verbose
     _quiet = args.quiet
+    _no_cache = args.no_cache
 
     # Validate input file exists.
     if not args.input.exists():
@@ -649,7 +1263,7 @@ def main() -> int:
         return merge_streams(args.input, args.output, args.indices, args.languages)
 
     if args.command == "translate":
-        return translate_stream(args.input, args.output, args.target_language, args.api_key, args.base_url, args.model)
+        return translate_stream(args.input, args.output, args.target_language, args.api_key, args.base_url, args.model, args.max_concurrency, args.rpm, args.tpm, args.chunk_tokens)
 
     if args.command == "transcribe":
         return transcribe_stream(args.input, args.output, args.model, args.language)
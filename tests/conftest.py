@@ -0,0 +1,40 @@
+"""Shared pytest setup for the suite.
+
+Puts scripts/ on sys.path once instead of per test module, and resets
+the CLI-set module flags after every test so a test that drives main()
+cannot leak --quiet/--verbose/--no-cache state into later tests.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Resolved once at collection time; .resolve() stats the filesystem, so
+# keep it out of anything that runs per test.
+SCRIPTS_DIR = (Path(__file__).parent.parent / "scripts").resolve()
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import pipeline
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _stub_require_bin():
+    """Stub _require_bin once per session so tests never need ffmpeg/ffprobe.
+
+    Applied at the pipeline attribute, so test_helpers' direct import of
+    the real function keeps testing the unstubbed behavior.
+    """
+    with patch.object(pipeline, "_require_bin"):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def _reset_module_flags():
+    yield
+    pipeline._verbose = False
+    pipeline._quiet = False
+    pipeline._no_cache = False
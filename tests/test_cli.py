@@ -2,23 +2,20 @@
 
 from __future__ import annotations
 
-import sys
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
 import pytest
 
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
-
 import pipeline
 
 
-# Always stub out _require_bin so tests don't need ffmpeg/ffprobe installed.
+# _require_bin is stubbed session-wide in conftest.py; main() additionally
+# checks the input path, which these fake /movies/ paths must survive.
 @pytest.fixture(autouse=True)
-def stub_require_bin():
-    with patch("pipeline._require_bin"):
-        with patch("pathlib.Path.exists", return_value=True):
-            yield
+def stub_input_exists():
+    with patch("pathlib.Path.exists", return_value=True):
+        yield
 
 
 class TestMainList:
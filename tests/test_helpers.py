@@ -3,15 +3,11 @@
 from __future__ import annotations
 
 import subprocess
-import sys
-from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
-
-from pipeline import _chunk_list, _require_bin, _run
+from pipeline import _chunk_by_tokens, _chunk_list, _require_bin, _run
 
 
 # ---------------------------------------------------------------------------
@@ -52,6 +48,19 @@ class TestRun:
                 ["echo", "hi"], capture_output=True, text=True, encoding="utf-8"
             )
 
+    def test_capture_false_discards_stdout(self):
+        """With capture=False, stdout goes to DEVNULL but stderr stays piped."""
+        fake = subprocess.CompletedProcess(
+            args=["cmd"], returncode=0, stdout=None, stderr=""
+        )
+        with patch("subprocess.run", return_value=fake) as mock:
+            result = _run(["cmd"], capture=False)
+            assert result.returncode == 0
+            mock.assert_called_once_with(
+                ["cmd"], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                text=True, encoding="utf-8",
+            )
+
     def test_verbose_stderr_forwarded(self, capsys):
         """When _verbose is True, stderr is printed."""
         import pipeline
@@ -113,3 +122,41 @@ class TestChunkList:
     def test_chunk_size_one(self):
         chunks = list(_chunk_list([1, 2, 3], 1))
         assert chunks == [[1], [2], [3]]
+
+
+# ---------------------------------------------------------------------------
+# _chunk_by_tokens
+# ---------------------------------------------------------------------------
+
+def _entry(text: str) -> dict:
+    return {"start": 0.0, "end": 1.0, "text": text, "index": 1}
+
+
+class TestChunkByTokens:
+    def test_all_fit_in_one_chunk(self):
+        entries = [_entry("short line") for _ in range(5)]
+        chunks = _chunk_by_tokens(entries, 1000)
+        assert len(chunks) == 1
+        assert len(chunks[0]) == 5
+
+    def test_splits_at_budget(self):
+        # Each entry costs 100//4 + 8 = 33 estimated tokens.
+        entries = [_entry("x" * 100) for _ in range(10)]
+        chunks = _chunk_by_tokens(entries, 100)
+        assert all(len(c) <= 3 for c in chunks)
+        assert sum(len(c) for c in chunks) == 10
+
+    def test_oversized_entry_gets_own_chunk(self):
+        entries = [_entry("x" * 4000), _entry("small")]
+        chunks = _chunk_by_tokens(entries, 100)
+        assert len(chunks) == 2
+        assert len(chunks[0]) == 1
+
+    def test_empty_entries(self):
+        assert _chunk_by_tokens([], 1000) == []
+
+    def test_order_preserved(self):
+        entries = [_entry(f"line {i}") for i in range(7)]
+        chunks = _chunk_by_tokens(entries, 30)
+        flattened = [e for c in chunks for e in c]
+        assert flattened == entries
@@ -2,15 +2,9 @@
 
 from __future__ import annotations
 
-import sys
-from datetime import timedelta
-from pathlib import Path
 
 import pytest
 
-# Ensure the scripts directory is importable.
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
-
 from pipeline import _format_srt_time, _parse_srt, _parse_srt_time
 
 
@@ -18,7 +12,7 @@ from pipeline import _format_srt_time, _parse_srt, _parse_srt_time
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _t(time_str: str) -> timedelta:
+def _t(time_str: str) -> int:
     """Shortcut for _parse_srt_time in test data."""
     return _parse_srt_time(time_str)
 
@@ -29,19 +23,17 @@ def _t(time_str: str) -> timedelta:
 
 class TestTimeConversion:
     def test_parse_basic(self):
-        td = _parse_srt_time("01:02:03,456")
-        assert td == timedelta(hours=1, minutes=2, seconds=3, milliseconds=456)
+        assert _parse_srt_time("01:02:03,456") == 3_723_456
 
     def test_parse_zero(self):
-        assert _parse_srt_time("00:00:00,000") == timedelta(0)
+        assert _parse_srt_time("00:00:00,000") == 0
 
     def test_roundtrip(self):
         original = "00:05:12,340"
         assert _format_srt_time(_parse_srt_time(original)) == original
 
     def test_format(self):
-        td = timedelta(hours=0, minutes=1, seconds=30, milliseconds=500)
-        assert _format_srt_time(td) == "00:01:30,500"
+        assert _format_srt_time(90_500) == "00:01:30,500"
 
 
 # ---------------------------------------------------------------------------
@@ -59,7 +51,18 @@ SAMPLE_SRT_LF = (
     "\n"
 )
 
-SAMPLE_SRT_CRLF = SAMPLE_SRT_LF.replace("\n", "\r\n")
+# Explicit CRLF fixture rather than deriving from the LF sample, so the
+# bytes under test are visible at a glance.
+SAMPLE_SRT_CRLF = (
+    "1\r\n"
+    "00:00:13,304 --> 00:00:15,849\r\n"
+    "You might not remember him, but...\r\n"
+    "\r\n"
+    "2\r\n"
+    "00:00:16,474 --> 00:00:18,309\r\n"
+    "Stay there. I'm coming back.\r\n"
+    "\r\n"
+)
 
 SAMPLE_SRT_NO_TRAILING_NEWLINE = (
     "1\n"
@@ -87,7 +90,7 @@ class TestParseSrt:
         assert len(entries) == 1
         assert entries[0]["text"] == "You might not remember him, but..."
 
-    def test_parse_timedelta_values(self):
+    def test_parse_time_values(self):
         entries = _parse_srt(SAMPLE_SRT_LF)
         assert entries[0]["start"] == _t("00:00:13,304")
         assert entries[0]["end"] == _t("00:00:15,849")
@@ -3,15 +3,12 @@
 from __future__ import annotations
 
 import subprocess
-import sys
 from datetime import timedelta
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
 import pytest
 
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
-
 from pipeline import merge_streams, _parse_srt_time as _t
 
 
@@ -51,30 +48,48 @@ JAPANESE_SRT = (
 )
 
 
-def _fake_run_for_stream(stream_idx):
-    """Return appropriate SRT based on stream index."""
-    content_map = {
-        "0:s:0": ENGLISH_SRT,
-        "0:s:1": CHINESE_SRT,
-        "0:s:2": JAPANESE_SRT,
-    }
-
-    def side_effect(cmd):
-        for key, content in content_map.items():
-            if key in cmd:
+# Frozen once at module level; the fake below only does dict lookups.
+CONTENT_MAP = {
+    "0:s:0": ENGLISH_SRT,
+    "0:s:1": CHINESE_SRT,
+    "0:s:2": JAPANESE_SRT,
+}
+
+
+def _fake_batched_run(cmd, **kwargs):
+    """Write the appropriate SRT for each -map output in the command.
+
+    merge_streams extracts all chosen streams with a single ffmpeg call
+    whose argv contains one ``-map <spec> -c:s srt <path>`` group per
+    stream, so the fake scans for those groups and writes the matching
+    sample content to each output path.
+    """
+    wrote_any = False
+    i = 0
+    while i < len(cmd):
+        if cmd[i] == "-map":
+            spec = cmd[i + 1]
+            if spec not in CONTENT_MAP:
                 return subprocess.CompletedProcess(
-                    args=cmd, returncode=0, stdout=content, stderr=""
+                    args=cmd, returncode=1, stdout="", stderr="stream not found"
                 )
-        return subprocess.CompletedProcess(args=cmd, returncode=1, stdout="", stderr="stream not found")
-
-    return side_effect
+            Path(cmd[i + 4]).write_text(CONTENT_MAP[spec], encoding="utf-8")
+            wrote_any = True
+            i += 5
+        else:
+            i += 1
+    if not wrote_any:
+        return subprocess.CompletedProcess(
+            args=cmd, returncode=1, stdout="", stderr="no -map given"
+        )
+    return subprocess.CompletedProcess(args=cmd, returncode=0, stdout="", stderr="")
 
 
 class TestMergeStreams:
     @patch("pipeline._run")
     @patch("pipeline.probe_subtitle_streams", return_value=SAMPLE_STREAMS)
     def test_merge_by_languages(self, mock_probe, mock_run, tmp_path):
-        mock_run.side_effect = _fake_run_for_stream(None)
+        mock_run.side_effect = _fake_batched_run
         output = tmp_path / "merged.srt"
         ret = merge_streams(
             Path("/movies/movie.mkv"), output_path=output,
@@ -89,7 +104,7 @@ class TestMergeStreams:
     @patch("pipeline._run")
     @patch("pipeline.probe_subtitle_streams", return_value=SAMPLE_STREAMS)
     def test_merge_by_indices(self, mock_probe, mock_run, tmp_path):
-        mock_run.side_effect = _fake_run_for_stream(None)
+        mock_run.side_effect = _fake_batched_run
         output = tmp_path / "merged.srt"
         ret = merge_streams(
             Path("/movies/movie.mkv"), output_path=output,
@@ -103,7 +118,7 @@ class TestMergeStreams:
     @patch("pipeline._run")
     @patch("pipeline.probe_subtitle_streams", return_value=SAMPLE_STREAMS)
     def test_merge_default_first_two(self, mock_probe, mock_run, tmp_path):
-        mock_run.side_effect = _fake_run_for_stream(None)
+        mock_run.side_effect = _fake_batched_run
         output = tmp_path / "merged.srt"
         ret = merge_streams(
             Path("/movies/movie.mkv"), output_path=output,
@@ -117,7 +132,7 @@ class TestMergeStreams:
     @patch("pipeline._run")
     @patch("pipeline.probe_subtitle_streams", return_value=SAMPLE_STREAMS)
     def test_merge_three_streams(self, mock_probe, mock_run, tmp_path):
-        mock_run.side_effect = _fake_run_for_stream(None)
+        mock_run.side_effect = _fake_batched_run
         output = tmp_path / "merged.srt"
         ret = merge_streams(
             Path("/movies/movie.mkv"), output_path=output,
@@ -170,7 +185,7 @@ class TestMergeStreams:
     @patch("pipeline.probe_subtitle_streams", return_value=SAMPLE_STREAMS)
     def test_default_output_path_format(self, mock_probe, mock_run, tmp_path):
         """When output_path is None, the file is named with languages."""
-        mock_run.side_effect = _fake_run_for_stream(None)
+        mock_run.side_effect = _fake_batched_run
         # Use a path in tmp_path to ensure the default path is writable
         input_path = tmp_path / "movie.mkv"
         input_path.touch()
@@ -186,7 +201,7 @@ class TestMergeStreams:
     @patch("pipeline.probe_subtitle_streams", return_value=SAMPLE_STREAMS)
     def test_merged_entries_sorted_by_time(self, mock_probe, mock_run, tmp_path):
         """Merged SRT entries should be sorted by start time."""
-        mock_run.side_effect = _fake_run_for_stream(None)
+        mock_run.side_effect = _fake_batched_run
         output = tmp_path / "merged.srt"
         merge_streams(
             Path("/movies/movie.mkv"), output_path=output,
@@ -4,14 +4,12 @@ from __future__ import annotations
 
 import json
 import subprocess
-import sys
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
-
+import pipeline
 from pipeline import list_streams, probe_subtitle_streams
 
 # ---------------------------------------------------------------------------
@@ -47,9 +45,16 @@ FFPROBE_MISSING_TAGS = json.dumps({
 
 
 def _fake_run(stdout="", stderr="", returncode=0):
-    """Return a fake CompletedProcess for _run mocking."""
+    """Return a fake CompletedProcess for _run_bytes mocking.
+
+    The probe path keeps ffprobe output as raw bytes, so the string
+    fixtures are encoded here.
+    """
     return subprocess.CompletedProcess(
-        args=["ffprobe"], returncode=returncode, stdout=stdout, stderr=stderr
+        args=["ffprobe"],
+        returncode=returncode,
+        stdout=stdout.encode("utf-8"),
+        stderr=stderr.encode("utf-8"),
     )
 
 
@@ -58,7 +63,7 @@ def _fake_run(stdout="", stderr="", returncode=0):
 # ---------------------------------------------------------------------------
 
 class TestProbeSubtitleStreams:
-    @patch("pipeline._run")
+    @patch("pipeline._run_bytes")
     def test_two_streams_parsed(self, mock_run):
         mock_run.return_value = _fake_run(stdout=FFPROBE_TWO_STREAMS)
         streams = probe_subtitle_streams(Path("movie.mkv"))
@@ -74,13 +79,13 @@ class TestProbeSubtitleStreams:
         assert streams[1]["language"] == "jpn"
         assert streams[1]["codec"] == "ass"
 
-    @patch("pipeline._run")
+    @patch("pipeline._run_bytes")
     def test_no_streams(self, mock_run):
         mock_run.return_value = _fake_run(stdout=FFPROBE_NO_STREAMS)
         streams = probe_subtitle_streams(Path("movie.mkv"))
         assert streams == []
 
-    @patch("pipeline._run")
+    @patch("pipeline._run_bytes")
     def test_missing_tags_uses_defaults(self, mock_run):
         mock_run.return_value = _fake_run(stdout=FFPROBE_MISSING_TAGS)
         streams = probe_subtitle_streams(Path("movie.mkv"))
@@ -88,19 +93,123 @@ class TestProbeSubtitleStreams:
         assert streams[0]["language"] == "und"
         assert streams[0]["title"] == ""
 
-    @patch("pipeline._run")
+    @patch("pipeline._run_bytes")
     def test_ffprobe_failure_raises(self, mock_run):
         mock_run.return_value = _fake_run(returncode=1, stderr="ffprobe error")
         with pytest.raises(RuntimeError, match="ffprobe error"):
             probe_subtitle_streams(Path("bad.mkv"))
 
-    @patch("pipeline._run")
+    @patch("pipeline._run_bytes")
     def test_empty_stdout_returns_empty(self, mock_run):
         mock_run.return_value = _fake_run(stdout="{}")
         streams = probe_subtitle_streams(Path("movie.mkv"))
         assert streams == []
 
 
+# ---------------------------------------------------------------------------
+# PyAV probe path
+# ---------------------------------------------------------------------------
+
+def _fake_av_stream(index, codec, metadata):
+    s = MagicMock()
+    s.index = index
+    s.codec_context.name = codec
+    s.metadata = metadata
+    return s
+
+
+class TestProbeViaPyav:
+    def test_pyav_used_when_available(self, monkeypatch):
+        container = MagicMock()
+        container.streams.subtitles = [
+            _fake_av_stream(2, "subrip", {"language": "eng", "title": "English"}),
+        ]
+        fake_av = MagicMock()
+        fake_av.open.return_value = container
+        monkeypatch.setattr(pipeline, "av", fake_av)
+        streams = probe_subtitle_streams(Path("movie.mkv"))
+        assert streams == [
+            {
+                "subtitle_index": 0,
+                "global_index": 2,
+                "codec": "subrip",
+                "language": "eng",
+                "title": "English",
+            }
+        ]
+        fake_av.open.assert_called_once_with("movie.mkv")
+
+    def test_pyav_missing_metadata_uses_defaults(self, monkeypatch):
+        container = MagicMock()
+        container.streams.subtitles = [_fake_av_stream(5, "subrip", {})]
+        fake_av = MagicMock()
+        fake_av.open.return_value = container
+        monkeypatch.setattr(pipeline, "av", fake_av)
+        streams = probe_subtitle_streams(Path("movie.mkv"))
+        assert streams[0]["language"] == "und"
+        assert streams[0]["title"] == ""
+
+
+# ---------------------------------------------------------------------------
+# Probe cache
+# ---------------------------------------------------------------------------
+
+class TestProbeCache:
+    @pytest.fixture(autouse=True)
+    def isolated_cache(self, tmp_path, monkeypatch):
+        """Point the cache file at tmp_path and drop any in-memory state."""
+        monkeypatch.setattr(pipeline, "_PROBE_CACHE_PATH", tmp_path / "probe.json")
+        monkeypatch.setattr(pipeline, "_probe_cache", None)
+
+    @patch("pipeline._run_bytes")
+    def test_second_probe_hits_cache(self, mock_run, tmp_path):
+        media = tmp_path / "movie.mkv"
+        media.write_bytes(b"fake container")
+        mock_run.return_value = _fake_run(stdout=FFPROBE_TWO_STREAMS)
+        first = probe_subtitle_streams(media)
+        second = probe_subtitle_streams(media)
+        assert first == second
+        mock_run.assert_called_once()
+
+    @patch("pipeline._run_bytes")
+    def test_modified_file_invalidates_cache(self, mock_run, tmp_path):
+        import os
+
+        media = tmp_path / "movie.mkv"
+        media.write_bytes(b"fake container")
+        mock_run.return_value = _fake_run(stdout=FFPROBE_TWO_STREAMS)
+        probe_subtitle_streams(media)
+        # Bump mtime to simulate the file being rewritten.
+        st = media.stat()
+        os.utime(media, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        probe_subtitle_streams(media)
+        assert mock_run.call_count == 2
+
+    @patch("pipeline._run_bytes")
+    def test_modified_file_replaces_cache_entry(self, mock_run, tmp_path):
+        """Re-probing a rewritten file must not accumulate stale keys."""
+        import os
+
+        media = tmp_path / "movie.mkv"
+        media.write_bytes(b"fake container")
+        mock_run.return_value = _fake_run(stdout=FFPROBE_TWO_STREAMS)
+        probe_subtitle_streams(media)
+        st = media.stat()
+        os.utime(media, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        probe_subtitle_streams(media)
+        assert len(pipeline._load_probe_cache()) == 1
+
+    @patch("pipeline._run_bytes")
+    def test_no_cache_flag_bypasses(self, mock_run, tmp_path, monkeypatch):
+        monkeypatch.setattr(pipeline, "_no_cache", True)
+        media = tmp_path / "movie.mkv"
+        media.write_bytes(b"fake container")
+        mock_run.return_value = _fake_run(stdout=FFPROBE_TWO_STREAMS)
+        probe_subtitle_streams(media)
+        probe_subtitle_streams(media)
+        assert mock_run.call_count == 2
+
+
 # ---------------------------------------------------------------------------
 # list_streams
 # ---------------------------------------------------------------------------
@@ -3,17 +3,24 @@
 from __future__ import annotations
 
 import subprocess
-import sys
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
-
+import pipeline
 from pipeline import transcribe_stream
 
 
+# transcribe_stream resolves whisper through the cached _which helper;
+# clear it around each test so the per-test shutil.which patches apply.
+@pytest.fixture(autouse=True)
+def _clear_which_cache():
+    pipeline._which.cache_clear()
+    yield
+    pipeline._which.cache_clear()
+
+
 def _fake_run(returncode=0, stdout="", stderr=""):
     return subprocess.CompletedProcess(
         args=["whisper"], returncode=returncode, stdout=stdout, stderr=stderr
@@ -3,14 +3,11 @@
 from __future__ import annotations
 
 import json
-import sys
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
-
 from pipeline import _chunk_list, translate_chunk
 
 
@@ -109,6 +106,126 @@ class TestTranslateChunkApiError:
             translate_chunk(mock_client, CHUNK, "Spanish", "gpt-4o-mini")
 
 
+# ---------------------------------------------------------------------------
+# _translate_chunk_async retry behavior
+# ---------------------------------------------------------------------------
+
+import asyncio
+
+import pipeline
+from pipeline import _translate_chunk_async
+
+
+def _make_async_client(side_effects):
+    """Build a mock AsyncOpenAI client whose create() walks side_effects."""
+    mock_client = MagicMock()
+    mock_client.chat.completions.create = AsyncMock(side_effect=side_effects)
+    return mock_client
+
+
+def _response_with(content: str):
+    mock_message = MagicMock()
+    mock_message.content = content
+    mock_choice = MagicMock()
+    mock_choice.message = mock_message
+    mock_response = MagicMock()
+    mock_response.choices = [mock_choice]
+    return mock_response
+
+
+class _RateLimitError(Exception):
+    status_code = 429
+
+
+class TestRateBucket:
+    def test_acquire_within_capacity_does_not_wait(self):
+        bucket = pipeline._RateBucket(60)
+        with patch("pipeline.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            asyncio.run(bucket.acquire(10))
+            asyncio.run(bucket.acquire(10))
+        mock_sleep.assert_not_awaited()
+
+    def test_waits_when_drained(self):
+        class _Break(Exception):
+            pass
+
+        bucket = pipeline._RateBucket(120)
+        asyncio.run(bucket.acquire(120))
+        with patch("pipeline.asyncio.sleep", new=AsyncMock(side_effect=_Break)) as mock_sleep:
+            with pytest.raises(_Break):
+                asyncio.run(bucket.acquire(60))
+        # 60 tokens at 2 tokens/sec refill => roughly a 30s wait.
+        wait = mock_sleep.await_args[0][0]
+        assert 25 < wait <= 30.5
+
+    def test_over_capacity_cost_is_clamped(self):
+        """A cost above capacity must drain the bucket, not hang forever."""
+        bucket = pipeline._RateBucket(10)
+        with patch("pipeline.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            asyncio.run(bucket.acquire(50))
+        mock_sleep.assert_not_awaited()
+        assert bucket.level == 0
+
+
+class TestTranslateChunkRetry:
+    @patch("pipeline.asyncio.sleep", new_callable=AsyncMock)
+    def test_retries_on_rate_limit_then_succeeds(self, mock_sleep):
+        client = _make_async_client([
+            _RateLimitError("rate limit exceeded"),
+            _response_with(json.dumps(["Hola", "Mundo"])),
+        ])
+        result = asyncio.run(_translate_chunk_async(client, CHUNK, "Spanish", "gpt-4o-mini"))
+        assert result == ["Hola", "Mundo"]
+        assert client.chat.completions.create.await_count == 2
+        mock_sleep.assert_awaited_once()
+
+    @patch("pipeline.asyncio.sleep", new_callable=AsyncMock)
+    def test_non_retryable_error_raises_immediately(self, mock_sleep):
+        client = _make_async_client([ValueError("bad request")])
+        with pytest.raises(ValueError, match="bad request"):
+            asyncio.run(_translate_chunk_async(client, CHUNK, "Spanish", "gpt-4o-mini"))
+        assert client.chat.completions.create.await_count == 1
+        mock_sleep.assert_not_awaited()
+
+    @patch("pipeline.asyncio.sleep", new_callable=AsyncMock)
+    def test_gives_up_after_max_attempts(self, mock_sleep):
+        client = _make_async_client(_RateLimitError("rate limit exceeded"))
+        with pytest.raises(_RateLimitError):
+            asyncio.run(_translate_chunk_async(client, CHUNK, "Spanish", "gpt-4o-mini"))
+        assert client.chat.completions.create.await_count == 5
+
+
+# ---------------------------------------------------------------------------
+# _extract_to_string
+# ---------------------------------------------------------------------------
+
+import subprocess
+
+from pipeline import _extract_to_string
+
+
+class TestExtractToString:
+    @patch("pipeline._run")
+    def test_returns_stdout_on_success(self, mock_run):
+        mock_run.return_value = subprocess.CompletedProcess(
+            args=["ffmpeg"], returncode=0, stdout="1\n00:00:01,000 --> 00:00:02,000\nHi\n\n", stderr=""
+        )
+        content = _extract_to_string(Path("movie.mkv"), 0)
+        assert content is not None
+        assert "Hi" in content
+        cmd = mock_run.call_args[0][0]
+        assert cmd[-1] == "-"
+        assert "0:s:0" in cmd
+
+    @patch("pipeline._run")
+    def test_returns_none_on_failure(self, mock_run, capsys):
+        mock_run.return_value = subprocess.CompletedProcess(
+            args=["ffmpeg"], returncode=1, stdout="", stderr="no such stream"
+        )
+        assert _extract_to_string(Path("movie.mkv"), 3) is None
+        assert "no such stream" in capsys.readouterr().err
+
+
 # ---------------------------------------------------------------------------
 # translate_stream (integration-level with mocks)
 # ---------------------------------------------------------------------------
@@ -129,9 +246,10 @@ SAMPLE_SRT = (
 
 class TestTranslateStream:
     @patch("pipeline.OpenAI", new=MagicMock())
-    @patch("pipeline.translate_chunk", return_value=["你好世界", "再见"])
+    @patch("pipeline.AsyncOpenAI", new=MagicMock())
+    @patch("pipeline._translate_chunk_async", new_callable=AsyncMock, return_value=["你好世界", "再见"])
     def test_full_srt_flow(self, mock_chunk, tmp_path):
-        """translate_stream reads SRT, calls translate_chunk, writes output."""
+        """translate_stream reads SRT, dispatches chunks, writes output."""
         input_srt = tmp_path / "movie.eng.srt"
         input_srt.write_text(SAMPLE_SRT)
 
@@ -159,6 +277,7 @@ class TestTranslateStream:
         assert "openai" in capsys.readouterr().err
 
     @patch("pipeline.OpenAI", new=MagicMock())
+    @patch("pipeline.AsyncOpenAI", new=MagicMock())
     def test_no_api_key_returns_1(self, capsys):
         """Without API key, returns 1."""
         with patch("pipeline.os.environ.get", return_value=None), \
@@ -171,7 +290,8 @@ class TestTranslateStream:
         assert "API key" in capsys.readouterr().err
 
     @patch("pipeline.OpenAI", new=MagicMock())
-    @patch("pipeline.translate_chunk", return_value=["你好世界", "再见"])
+    @patch("pipeline.AsyncOpenAI", new=MagicMock())
+    @patch("pipeline._translate_chunk_async", new_callable=AsyncMock, return_value=["你好世界", "再见"])
     def test_custom_output_path(self, mock_chunk, tmp_path):
         input_srt = tmp_path / "movie.srt"
         input_srt.write_text(SAMPLE_SRT)
@@ -186,7 +306,8 @@ class TestTranslateStream:
         assert custom_out.exists()
 
     @patch("pipeline.OpenAI", new=MagicMock())
-    @patch("pipeline.translate_chunk", return_value=[])
+    @patch("pipeline.AsyncOpenAI", new=MagicMock())
+    @patch("pipeline._translate_chunk_async", new_callable=AsyncMock, return_value=[])
     def test_empty_srt_returns_1(self, mock_chunk, tmp_path, capsys):
         """Empty SRT content returns 1."""
         input_srt = tmp_path / "empty.srt"